@@ -5,21 +5,77 @@ processing Materials Project crystal structures with optional MACE features.
 """
 
 import os
+import pickle
 import warnings
 from collections.abc import Callable, Iterable
+from concurrent.futures import ProcessPoolExecutor
 
 import h5py
+import numpy as np
 import pandas as pd
 import torch
 from pymatgen.core import Lattice, Structure
 from torch_geometric.data import Data, InMemoryDataset
 from tqdm import tqdm
 
-from src.data.dataset_util import pmg_structure_to_pyg_data
+from src.data.dataset_util import lattice_sites_to_pyg_data
 
 warnings.filterwarnings("ignore", category=UserWarning, module="pymatgen")
 
 
+def _reduce_cif(cif: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Parse a CIF string and Niggli-reduce the structure.
+
+    Args:
+        cif: CIF string of the structure.
+
+    Returns:
+        Tuple of lattice parameters (6,), atomic numbers (N,) and
+        fractional coordinates (N, 3) of the reduced structure.
+    """
+    # Parse CIF string
+    st = Structure.from_str(str(cif), fmt="cif")  # type: ignore[arg-type]
+
+    # Niggli reduction for canonical form
+    reduced = st.get_reduced_structure()
+    return (
+        np.asarray(reduced.lattice.parameters, dtype=np.float64),
+        np.asarray(reduced.atomic_numbers, dtype=np.int64),
+        np.asarray(reduced.frac_coords, dtype=np.float64),
+    )
+
+
+def _to_pyg_data(
+    material_id: str,
+    lattice_params: np.ndarray,
+    atomic_numbers: np.ndarray,
+    frac_coords: np.ndarray,
+) -> Data:
+    """Build the PyG Data object of a reduced structure in canonical lattice form."""
+    return lattice_sites_to_pyg_data(
+        Lattice.from_parameters(*lattice_params),
+        atomic_numbers,
+        frac_coords,
+        material_id=material_id,
+    )
+
+
+def _load_processed(path: str) -> tuple[Data, dict[str, torch.Tensor]]:
+    """Load collated data saved by `MPDataset.process`.
+
+    Tensors are memory-mapped, so DataLoader workers share the OS page cache
+    instead of each holding a private copy of the dataset.
+    """
+    try:
+        data, slices = torch.load(path, weights_only=True, mmap=True)
+    except (pickle.UnpicklingError, RuntimeError):
+        # Processed by an older version that pickled the Data object itself
+        data, slices = torch.load(path, weights_only=False)
+    if isinstance(data, dict):
+        data = Data.from_dict(data)
+    return data, slices
+
+
 class MPDataset(InMemoryDataset):
     """InMemoryDataset for Materials Project data that caches processed graphs."""
 
@@ -50,21 +106,74 @@ class MPDataset(InMemoryDataset):
         raw_path = os.path.join(root, f"{self.split}.csv")
         self.df = pd.read_csv(raw_path).reset_index(drop=True)
 
+        # Preconvert lookup columns to arrays for positional indexing in `get`
+        self._material_ids = self.df["material_id"].to_numpy()
+        self._conditions: dict[str, np.ndarray] = {}
+        if target_condition is not None:
+            if isinstance(target_condition, str):  # single condition
+                if target_condition not in self.df.columns:
+                    msg = f"Condition {target_condition} not in dataframe columns"
+                    raise ValueError(msg)
+                condition_names = [target_condition]
+            elif isinstance(target_condition, Iterable):  # multiple conditions
+                if not all(t in self.df.columns for t in target_condition):
+                    msg = "Not all conditions found in dataframe columns"
+                    raise ValueError(msg)
+                condition_names = list(target_condition)
+            else:
+                raise ValueError("target_condition must be str or iterable[str]")
+            self._conditions = {t: self.df[t].to_numpy() for t in condition_names}
+
         super().__init__(root, transform, pre_transform)
 
         # Load processed data
         data_path = self.processed_paths[0]
-        self.data, self.slices = torch.load(data_path, weights_only=False)
+        self.data, self.slices = _load_processed(data_path)
 
-        # Optionally add MACE features
+        # MACE features are read lazily from HDF5 in `get`
+        self._h5_path = os.path.join(root, "mace_features.h5")
+        self._h5: h5py.File | None = None
+        self._h5_pid: int | None = None
+
+        # Packed layout (see src/utils/mace_embedd.py): material id -> row range
+        self._mace_rows: dict[str, tuple[int, int]] | None = None
         if mace_features:
-            self.mace_features_dict = dict()
-            with h5py.File(os.path.join(root, "mace_features.h5"), "r") as f:
-                for material_id in self.df["material_id"]:
-                    if str(material_id) in f:
-                        self.mace_features_dict[material_id] = torch.tensor(
-                            f[str(material_id)][:]  # type: ignore[index]
+            with h5py.File(self._h5_path, "r") as f:
+                if "features" in f and "ids" in f:
+                    ids = f["ids"].asstr()[()]  # type: ignore[union-attr]
+                    offsets = f["offsets"][()].tolist()  # type: ignore[union-attr]
+                    self._mace_rows = {
+                        material_id: (start, end)
+                        for material_id, start, end in zip(
+                            ids, offsets[:-1], offsets[1:], strict=True
                         )
+                    }
+
+    def __getstate__(self) -> dict:
+        # Open HDF5 handles cannot be pickled (e.g., for spawned DataLoader workers)
+        state = self.__dict__.copy()
+        state["_h5"] = None
+        state["_h5_pid"] = None
+        return state
+
+    def _get_h5(self) -> h5py.File:
+        """Return the HDF5 handle of MACE features, opened once per process.
+
+        The handle is (re)opened lazily so that each forked DataLoader worker
+        reads through its own file descriptor instead of sharing the parent's.
+        """
+        if self._h5 is None or self._h5_pid != os.getpid():
+            self._h5 = h5py.File(self._h5_path, "r")
+            self._h5_pid = os.getpid()
+        return self._h5
+
+    def _read_mace_features(self, material_id: str) -> np.ndarray:
+        """Read the MACE features of a single material from HDF5."""
+        f = self._get_h5()
+        if self._mace_rows is None:  # legacy layout: one dataset per material
+            return f[material_id][()]  # type: ignore[index]
+        start, end = self._mace_rows[material_id]
+        return f["features"][start:end]  # type: ignore[index]
 
     @property
     def raw_file_names(self) -> list[str]:
@@ -88,31 +197,51 @@ class MPDataset(InMemoryDataset):
 
     def process(self) -> None:
         """Process raw data files into PyG Data objects."""
-        data_list: list[Data] = []
-        for _, row in tqdm(
-            self.df.iterrows(),
-            total=len(self.df),
-            desc=f"Processing {self.split} dataset",
-        ):
-            # Get material ID
-            material_id = row["material_id"]
-
-            # Parse CIF string
-            cif_str = str(row["cif"])
-            st = Structure.from_str(cif_str, fmt="cif")  # type: ignore[arg-type]
-
-            # Niggli reduction for canonical form
-            reduced = st.get_reduced_structure()
-            canonical = Structure(
-                lattice=Lattice.from_parameters(*reduced.lattice.parameters),
-                species=reduced.species,
-                coords=reduced.frac_coords,
-                coords_are_cartesian=False,
+        material_ids = self.df["material_id"].to_numpy(dtype=str)
+
+        # Reduced structures are cached as arrays so that re-processing a split
+        # (e.g., with a new pre_transform) skips CIF parsing entirely
+        cache_path = os.path.join(self.processed_dir, f"{self.split}_structures.npz")
+        structures = None
+        if os.path.exists(cache_path):
+            with np.load(cache_path) as cache:
+                if np.array_equal(cache["material_ids"], material_ids):
+                    sections = np.cumsum(cache["num_atoms"])[:-1]
+                    structures = list(
+                        zip(
+                            cache["lattice_params"],
+                            np.split(cache["atomic_numbers"], sections),
+                            np.split(cache["frac_coords"], sections),
+                            strict=True,
+                        )
+                    )
+
+        if structures is None:
+            # CIF parsing is independent per row, so spread it over processes
+            with ProcessPoolExecutor() as executor:
+                structures = list(
+                    tqdm(
+                        executor.map(_reduce_cif, self.df["cif"], chunksize=64),
+                        total=len(self.df),
+                        desc=f"Processing {self.split} dataset",
+                    )
+                )
+            np.savez(
+                cache_path,
+                material_ids=material_ids,
+                lattice_params=np.stack([s[0] for s in structures]),
+                num_atoms=np.array([len(s[1]) for s in structures]),
+                atomic_numbers=np.concatenate([s[1] for s in structures]),
+                frac_coords=np.concatenate([s[2] for s in structures]),
             )
 
-            # Convert to PyG Data
-            graph = pmg_structure_to_pyg_data(canonical, material_id=material_id)
-            data_list.append(graph)
+        # Convert to PyG Data
+        data_list = [
+            _to_pyg_data(material_id, *structure)
+            for material_id, structure in zip(
+                self.df["material_id"], structures, strict=True
+            )
+        ]
 
         # Optionally apply pre_transform
         if self.pre_transform is not None:
@@ -120,7 +249,7 @@ class MPDataset(InMemoryDataset):
 
         # Collate and save
         data, slices = self.collate(data_list)
-        torch.save((data, slices), self.processed_paths[0])
+        torch.save((data.to_dict(), slices), self.processed_paths[0])
 
     def get(self, idx: int):
         """Get data object by index with optional conditions and MACE features.
@@ -135,23 +264,13 @@ class MPDataset(InMemoryDataset):
 
         # Dynamically attach condition if specified
         if self.target_condition is not None:
-            if isinstance(self.target_condition, str):  # single condition
-                if self.target_condition not in self.df.columns:
-                    msg = f"Condition {self.target_condition} not in dataframe columns"
-                    raise ValueError(msg)
-                y = {self.target_condition: self.df.loc[idx, self.target_condition]}
-            elif isinstance(self.target_condition, Iterable):  # multiple conditions
-                if not all(t in self.df.columns for t in self.target_condition):
-                    msg = "Not all conditions found in dataframe columns"
-                    raise ValueError(msg)
-                y = {t: self.df.loc[idx, t] for t in self.target_condition}
-            else:
-                raise ValueError("target_condition must be str or iterable[str]")
             data.target_condition = self.target_condition
-            data.y = y
+            data.y = {t: values[idx] for t, values in self._conditions.items()}
 
         # Dynamically attach MACE features if available
         if self.mace_features:
-            material_id = self.df.loc[idx, "material_id"]
-            data.mace_features = self.mace_features_dict[material_id]
+            material_id = self._material_ids[idx]
+            data.mace_features = torch.from_numpy(
+                self._read_mace_features(str(material_id))
+            )
         return data
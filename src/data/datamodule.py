@@ -4,6 +4,7 @@ This module provides a LightningDataModule wrapper for loading and batching
 crystal structure data with support for Materials Project datasets.
 """
 
+import torch
 from lightning import LightningDataModule
 from torch_geometric.loader import DataLoader
 
@@ -23,6 +24,7 @@ class DataModule(LightningDataModule):
         mace_features: bool = False,
         num_workers: int = 0,
         pin_memory: bool = True,
+        preload_to_device: bool = False,
     ) -> None:
         super().__init__()
         # Configs for dataset
@@ -37,6 +39,14 @@ class DataModule(LightningDataModule):
         self.num_workers = num_workers
         self.pin_memory = pin_memory
 
+        # Keep the collated graphs on the training device so batches need no
+        # host-to-device copy. Device tensors can be neither pinned nor shared
+        # with worker processes, so loading happens in the main process.
+        self.preload_to_device = preload_to_device
+        if preload_to_device:
+            self.num_workers = 0
+            self.pin_memory = False
+
         # Initialize datasets
         self.train_dataset = None
         self.val_dataset = None
@@ -47,27 +57,32 @@ class DataModule(LightningDataModule):
         """Return the dataset class based on the dataset type."""
         return MPDataset
 
+    def _build_dataset(self, split: str) -> MPDataset:
+        dataset = self.dataset_cls(
+            root=self.data_dir,
+            split=split,
+            target_condition=self.target_condition,
+            mace_features=self.mace_features,
+        )
+        # Only move freshly built datasets: PyG refuses to move one that has
+        # already been indexed, e.g. the fit datasets when setup("test") runs later
+        if self.preload_to_device and self.trainer is not None:
+            dataset.to(str(self.trainer.strategy.root_device))
+        return dataset
+
     def setup(self, stage: str | None = None) -> None:
         if stage == "fit" or stage is None:
-            self.train_dataset = self.dataset_cls(
-                root=self.data_dir,
-                split="train",
-                target_condition=self.target_condition,
-                mace_features=self.mace_features,
-            )
-            self.val_dataset = self.dataset_cls(
-                root=self.data_dir,
-                split="val",
-                target_condition=self.target_condition,
-                mace_features=self.mace_features,
-            )
+            self.train_dataset = self._build_dataset("train")
+            self.val_dataset = self._build_dataset("val")
         if stage == "test" or stage is None:
-            self.test_dataset = self.dataset_cls(
-                root=self.data_dir,
-                split="test",
-                target_condition=self.target_condition,
-                mace_features=self.mace_features,
-            )
+            self.test_dataset = self._build_dataset("test")
+
+    def transfer_batch_to_device(
+        self, batch: CrystalBatch, device: torch.device, dataloader_idx: int
+    ) -> CrystalBatch:
+        # Lightning only passes non_blocking to plain tensors. With pin_memory the
+        # DataLoader pins whole batches, so the host-to-device copy can be async
+        return batch.to(device, non_blocking=self.pin_memory)
 
     def train_dataloader(self) -> DataLoader:
         loader = DataLoader(
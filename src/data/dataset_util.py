@@ -4,6 +4,9 @@ This module provides conversion functions between pymatgen Structure objects,
 PyTorch Geometric Data objects, and ASE Atoms objects.
 """
 
+from collections.abc import Sequence
+
+import numpy as np
 import torch
 from ase import Atoms
 from pymatgen.core import Lattice, Structure
@@ -11,26 +14,43 @@ from torch_geometric.data import Batch, Data
 
 
 def pmg_structure_to_pyg_data(pmg_structure: Structure, **kwargs) -> Data:
-    lengths = torch.as_tensor(
-        pmg_structure.lattice.lengths, dtype=torch.float
-    ).unsqueeze(0)
-    angles = torch.as_tensor(pmg_structure.lattice.angles, dtype=torch.float).unsqueeze(
-        0
+    return lattice_sites_to_pyg_data(
+        pmg_structure.lattice,
+        pmg_structure.atomic_numbers,
+        pmg_structure.frac_coords,
+        **kwargs,
+    )
+
+
+def lattice_sites_to_pyg_data(
+    lattice: Lattice,
+    atomic_numbers: Sequence[int] | np.ndarray,
+    frac_coords: np.ndarray,
+    **kwargs,
+) -> Data:
+    """Build a PyG Data object from a lattice and its sites.
+
+    Same result as `pmg_structure_to_pyg_data` on the equivalent Structure,
+    without constructing the per-site pymatgen objects.
+    """
+    num_atoms = len(frac_coords)
+    cart_coords = torch.as_tensor(
+        lattice.get_cartesian_coords(frac_coords), dtype=torch.float
     )
+    lengths = torch.as_tensor(lattice.lengths, dtype=torch.float).unsqueeze(0)
+    angles = torch.as_tensor(lattice.angles, dtype=torch.float).unsqueeze(0)
     return Data(
-        pos=torch.as_tensor(pmg_structure.cart_coords, dtype=torch.float),
-        atom_types=torch.as_tensor(pmg_structure.atomic_numbers, dtype=torch.long),
-        frac_coords=torch.as_tensor(pmg_structure.frac_coords, dtype=torch.float),
-        cart_coords=torch.as_tensor(pmg_structure.cart_coords, dtype=torch.float),
-        lattices=torch.as_tensor(
-            pmg_structure.lattice.matrix.copy(), dtype=torch.float
-        ).unsqueeze(0),
-        num_atoms=torch.as_tensor([len(pmg_structure)], dtype=torch.long),
+        pos=cart_coords,
+        atom_types=torch.as_tensor(atomic_numbers, dtype=torch.long),
+        frac_coords=torch.as_tensor(frac_coords, dtype=torch.float),
+        cart_coords=cart_coords.clone(),
+        lattices=torch.as_tensor(lattice.matrix.copy(), dtype=torch.float).unsqueeze(0),
+        num_atoms=torch.as_tensor([num_atoms], dtype=torch.long),
         lengths=lengths,
-        lengths_scaled=lengths / len(pmg_structure) ** (1 / 3),
+        lengths_scaled=lengths / num_atoms ** (1 / 3),
         angles=angles,
         angles_radians=torch.deg2rad(angles),
-        token_idx=torch.arange(len(pmg_structure), dtype=torch.long),
+        token_idx=torch.arange(num_atoms, dtype=torch.long),
         **kwargs,
     )
 
@@ -6,6 +6,7 @@ with additional methods for crystal structure manipulation and conversion.
 
 from typing import Any
 
+import numpy as np
 import torch
 from ase import Atoms
 from pymatgen.core import Structure
@@ -93,8 +94,10 @@ class CrystalBatch(Batch):
                 raise KeyError(f"Attribute '{key}' not found in the batch.")
             delattr(self, key)
 
-    def to(self, device: str | torch.device) -> "CrystalBatch":
-        return super().apply(lambda x: x.to(device))  # type: ignore
+    def to(
+        self, device: str | torch.device, non_blocking: bool = False
+    ) -> "CrystalBatch":
+        return super().apply(lambda x: x.to(device, non_blocking=non_blocking))  # type: ignore
 
     def to_atoms(self, **kwargs) -> list[Atoms]:
         return batch_to_atoms_list(self, **kwargs)
@@ -115,29 +118,57 @@ class CrystalBatch(Batch):
 
 
 def create_empty_batch(
-    num_atoms: list[int],
+    num_atoms: list[int] | np.ndarray | Tensor,
     device: str,
     atom_types: list[list[int]] | None = None,
 ) -> CrystalBatch:
-    return CrystalBatch.from_data_list(
-        [
-            Data(
-                pos=torch.empty((n, 3)),
-                atom_types=(
-                    torch.empty((n,))
-                    if atom_types is None
-                    else torch.tensor(atom_types[i], dtype=torch.long)
-                ),
-                frac_coords=torch.empty((n, 3)),
-                cart_coords=torch.empty((n, 3)),
-                lattices=torch.empty((1, 3, 3)),
-                num_atoms=torch.as_tensor(n, dtype=torch.long),
-                lengths=torch.empty((1, 3)),
-                lengths_scaled=torch.empty((1, 3)),
-                angles=torch.empty((1, 3)),
-                angles_radians=torch.empty((1, 3)),
-                token_idx=torch.arange(n, dtype=torch.long),
-            )
-            for i, n in enumerate(num_atoms)
-        ]
-    ).to(device=device)
+    """Allocate an uninitialized CrystalBatch with `num_atoms[i]` atoms per crystal.
+
+    Equivalent to collating one empty Data object per crystal, but every field
+    is allocated at once instead of looping over the crystals in Python.
+    `num_atoms` may be an int64 array or tensor, which is used without copying
+    it element by element.
+    """
+    counts = torch.as_tensor(num_atoms, dtype=torch.long).cpu()
+    num_graphs = counts.numel()
+    total_atoms = int(counts.sum())
+    ptr = torch.zeros(num_graphs + 1, dtype=torch.long)
+    torch.cumsum(counts, dim=0, out=ptr[1:])
+    batch_idx = torch.repeat_interleave(
+        torch.arange(num_graphs), counts, output_size=total_atoms
+    )
+
+    batch = CrystalBatch(
+        _base_cls=Data,
+        pos=torch.empty((total_atoms, 3)),
+        atom_types=(
+            torch.empty((total_atoms,))
+            if atom_types is None
+            else torch.cat([torch.as_tensor(t, dtype=torch.long) for t in atom_types])
+        ),
+        frac_coords=torch.empty((total_atoms, 3)),
+        cart_coords=torch.empty((total_atoms, 3)),
+        lattices=torch.empty((num_graphs, 3, 3)),
+        num_atoms=counts.clone(),
+        lengths=torch.empty((num_graphs, 3)),
+        lengths_scaled=torch.empty((num_graphs, 3)),
+        angles=torch.empty((num_graphs, 3)),
+        angles_radians=torch.empty((num_graphs, 3)),
+        token_idx=torch.arange(total_atoms) - ptr[batch_idx],
+        batch=batch_idx,
+        ptr=ptr,
+    )
+
+    # Bookkeeping that `Batch.from_data_list` keeps for `get_example`/`to_data_list`
+    node_slices, graph_slices = ptr.clone(), torch.arange(num_graphs + 1)
+    node_keys = ("pos", "atom_types", "frac_coords", "cart_coords", "token_idx")
+    batch._num_graphs = num_graphs
+    batch._slice_dict = {
+        key: node_slices if key in node_keys else graph_slices
+        for key in batch.keys()
+        if key not in ("batch", "ptr")
+    }
+    batch._inc_dict = {
+        key: torch.zeros(num_graphs, dtype=torch.long) for key in batch._slice_dict
+    }
+    return batch.to(device=device)
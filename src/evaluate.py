@@ -4,12 +4,14 @@ This script evaluates generated structures against reference datasets using
 various metrics including structure matching, stability, and coverage.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import fire
 from monty.serialization import loadfn
 from pymatgen.analysis.structure_matcher import StructureMatcher
 from pymatgen.core import Structure
+from tqdm import tqdm
 
 from src.sample import sample
 from src.utils.metrics import Metrics
@@ -41,10 +43,16 @@ def evaluate(
     if structure_path.endswith(".json") or structure_path.endswith(".gz"):
         gen_structures = loadfn(structure_path)
     else:
-        structures_dir = Path(structure_path)
-        gen_structures = [
-            Structure.from_file(file) for file in structures_dir.glob("*.cif")
-        ]
+        files = list(Path(structure_path).glob("*.cif"))
+        # CIF parsing is pure-Python pymatgen work, so spread it over processes
+        with ProcessPoolExecutor() as executor:
+            gen_structures = list(
+                tqdm(
+                    executor.map(Structure.from_file, files, chunksize=32),
+                    total=len(files),
+                    desc="Loading structures",
+                )
+            )
     print(f"Loaded {len(gen_structures)} generated structures from {structure_path}")
 
     # StructureMatcher parameters
@@ -25,6 +25,8 @@ from collections.abc import Callable
 import torch
 import torch.nn as nn
 
+from src.utils.positional_embedding import sinusoidal_embedding
+
 
 def modulate(x, shift, scale):
     return x * (1 + scale.unsqueeze(1)) + shift.unsqueeze(1)
@@ -69,19 +71,6 @@ class TimestepEmbedder(nn.Module):
         return t_emb
 
 
-def get_pos_embedding(indices, emb_dim, max_len=2048):
-    """Creates sine / cosine positional embeddings from a prespecified indices."""
-    K = torch.arange(emb_dim // 2, device=indices.device)
-    pos_embedding_sin = torch.sin(
-        indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
-    ).to(indices.device)
-    pos_embedding_cos = torch.cos(
-        indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
-    ).to(indices.device)
-    pos_embedding = torch.cat([pos_embedding_sin, pos_embedding_cos], dim=-1)
-    return pos_embedding
-
-
 #################################################################################
 #                                 Core DiT Model                                #
 #################################################################################
@@ -250,7 +239,7 @@ class DiT(nn.Module):
         y: (B,) tensor of class labels
         """
         token_indices = torch.cumsum(mask, dim=-1) - 1
-        pos_emb = get_pos_embedding(token_indices, self.hidden_size)
+        pos_emb = sinusoidal_embedding(token_indices, self.hidden_size)
         x = self.x_embedder(x) + pos_emb  # (B, N, H)
         t = self.t_embedder(t)  # (B, H)
         y = (
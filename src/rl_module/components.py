@@ -21,6 +21,7 @@ class RewardComponent(ABC, torch.nn.Module):
     """Base class for all reward components."""
 
     required_metrics: list[str] = []
+    requires_structures: bool = True  # False if only `batch_gen` is used
 
     def __init__(
         self,
@@ -219,6 +220,7 @@ class PredictorReward(RewardComponent):
     """Rewards structures based on Predictor module as a surrogate model."""
 
     required_metrics = []
+    requires_structures = False
 
     def __init__(
         self,
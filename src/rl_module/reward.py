@@ -16,11 +16,13 @@ class ReinforceReward(torch.nn.Module):
         normalize_fn: str | None = None,
         eps: float = 1e-4,
         reference_dataset: str = "mp-20",
+        check_nan: bool = True,
     ):
         super().__init__()
         self.components = torch.nn.ModuleList(components)
         self.normalize_fn = normalize_fn
         self.eps = eps
+        self.check_nan = check_nan
 
         # Collect all required metrics from components
         all_metrics = set()
@@ -38,16 +40,21 @@ class ReinforceReward(torch.nn.Module):
         else:
             self.metrics = None
 
+        # Skip tensor -> pymatgen conversion if no metric or component needs it
+        self.requires_structures = self.metrics is not None or any(
+            getattr(component, "requires_structures", True) for component in components
+        )
+
     @torch.no_grad()
     def forward(
         self, batch_gen: CrystalBatch, device: torch.device | None = None
     ) -> torch.Tensor:
-        gen_structures = batch_gen.to_structure()
+        gen_structures = batch_gen.to_structure() if self.requires_structures else None
 
         # Collect metrics if needed
         if self.metrics is not None:
-            with torch.enable_grad():  # Enable grad for mace-torch
-                self.metrics.compute(gen_structures=gen_structures)
+            assert gen_structures is not None
+            self.metrics.compute(gen_structures=gen_structures)
 
         # Compute rewards from all components
         device = device if device is not None else batch_gen.pos.device
@@ -61,9 +68,6 @@ class ReinforceReward(torch.nn.Module):
             )
             total_rewards += comp_rewards
 
-        if torch.isnan(total_rewards).any():
-            raise ValueError("NaN values found in rewards.")
-
         return total_rewards
 
     def normalize(self, rewards: torch.Tensor) -> torch.Tensor:
@@ -81,4 +85,10 @@ class ReinforceReward(torch.nn.Module):
             raise ValueError(
                 f"Unknown normalization type: {self.normalize_fn}. Use 'norm', 'std', 'clip', or None."
             )
+
+        # A NaN/inf reward turns every advantage into NaN and corrupts the weights
+        # on the next step. The "std" and "norm" normalizers have already synced
+        # with the device above, so checking here adds no extra stall
+        if self.check_nan and not torch.isfinite(rewards).all():
+            raise ValueError("NaN or infinite values found in rewards.")
         return rewards
@@ -109,10 +109,10 @@ def sample(
     else:
         num_atom_dist_dict = NUM_ATOM_DISTRIBUTIONS[num_atom_distribution]
         num_atoms = np.random.choice(
-            list(num_atom_dist_dict.keys()),
-            p=list(num_atom_dist_dict.values()),
+            np.fromiter(num_atom_dist_dict.keys(), dtype=np.int64),
+            p=np.fromiter(num_atom_dist_dict.values(), dtype=np.float64),
             size=num_samples,
-        ).tolist()
+        )
         print(f"DNG task: {num_samples} samples")
     # Set default batch size
     total_num_samples = len(num_atoms)
@@ -34,6 +34,11 @@ def get_checkpoint(name: str) -> Path:
     retry_attempts = config["config"].get("retry_attempts", 3)
     retry_delay = config["config"].get("retry_delay", 2)
 
+    # Reuse a completed local download without querying the Hub on every startup
+    local_path = (Path(local_dir) / ckpt_info["hf_path"]).resolve()
+    if local_path.is_file():
+        return local_path
+
     # Download with retry
     last_error = None
     for attempt in range(retry_attempts):
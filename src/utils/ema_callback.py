@@ -1,9 +1,30 @@
 """Exponential Moving Average callback for PyTorch Lightning."""
 
+from collections.abc import Iterable
+
+import torch
 from lightning.pytorch.callbacks import Callback
 from torch_ema import ExponentialMovingAverage
 
 
+class ForeachExponentialMovingAverage(ExponentialMovingAverage):
+    """ExponentialMovingAverage whose update is a single multi-tensor kernel.
+
+    ``torch_ema`` updates the shadow parameters one tensor at a time, which
+    launches several kernels per parameter on every training step.
+    """
+
+    def update(self, parameters: Iterable[torch.nn.Parameter] | None = None) -> None:
+        parameters = list(self._get_parameters(parameters))
+        decay = self.decay
+        if self.num_updates is not None:
+            self.num_updates += 1
+            decay = min(decay, (1 + self.num_updates) / (10 + self.num_updates))
+        with torch.no_grad():
+            # s - (1 - decay) * (s - p) == lerp(s, p, 1 - decay)
+            torch._foreach_lerp_(self.shadow_params, parameters, 1.0 - decay)
+
+
 class EMA(Callback):
     """Exponential Moving Average callback for model weights."""
 
@@ -13,7 +34,9 @@ class EMA(Callback):
         self.ema = None
 
     def on_fit_start(self, trainer, pl_module) -> None:
-        self.ema = ExponentialMovingAverage(pl_module.parameters(), decay=self.decay)
+        self.ema = ForeachExponentialMovingAverage(
+            pl_module.parameters(), decay=self.decay
+        )
 
     def on_train_batch_end(self, trainer, pl_module, *_) -> None:
         self.ema.update(pl_module.parameters())
@@ -29,5 +52,7 @@ class EMA(Callback):
         ckpt["ema_state"] = self.ema.state_dict()
 
     def on_load_checkpoint(self, trainer, pl_module, ckpt) -> None:
-        self.ema = ExponentialMovingAverage(pl_module.parameters(), decay=self.decay)
+        self.ema = ForeachExponentialMovingAverage(
+            pl_module.parameters(), decay=self.decay
+        )
         self.ema.load_state_dict(ckpt["ema_state"])
@@ -66,8 +66,12 @@ def featurize(
                 latent_vector = torch.cat([latent_vector, encoded["x"]], dim=-1)
             composition_vector = vae.encoder.atom_type_embedder(batch.atom_types)  # type: ignore
 
-        structure_feature = reduce_fn(latent_vector, batch.batch, dim=0)
-        composition_feature = reduce_fn(composition_vector, batch.batch, dim=0)
+        structure_feature = reduce_fn(
+            latent_vector, batch.batch, dim=0, dim_size=batch.num_graphs
+        )
+        composition_feature = reduce_fn(
+            composition_vector, batch.batch, dim=0, dim_size=batch.num_graphs
+        )
         structure_features.append(structure_feature)
         composition_features.append(composition_feature)
         atom_features.extend(
@@ -0,0 +1,118 @@
+"""MACE descriptor extraction for the Foundation Alignment loss.
+
+This script computes per-atom MACE descriptors for every structure of a dataset
+and stores them in ``mace_features.h5`` next to the split CSV files. The file
+uses a packed layout that ``MPDataset`` reads with a single slice per sample:
+
+- ``features``: (total_atoms, D) per-atom descriptors of all materials,
+  stored as float16 by default to halve the bytes read per epoch
+- ``ids``: (N,) material ids
+- ``offsets``: (N + 1,) row offsets, material ``ids[i]`` owns
+  ``features[offsets[i]:offsets[i + 1]]``
+"""
+
+import os
+
+import h5py
+import numpy as np
+import torch
+from fire import Fire
+from tqdm import tqdm
+
+from src.data.components.mp_dataset import MPDataset
+from src.data.dataset_util import batch_to_atoms_list
+from src.data.schema import CrystalBatch
+
+
+def _write_rows(
+    f: h5py.File,
+    dataset: h5py.Dataset | None,
+    start: int,
+    rows: list[np.ndarray],
+    num_rows: int,
+    dtype: str,
+) -> h5py.Dataset:
+    """Write (n_i, D) arrays to the ``features`` dataset from row ``start`` on.
+
+    The dataset is created on the first call, once D is known, as a single
+    contiguous (unchunked) block of ``num_rows`` rows, so reading a sample is
+    one hyperslab read of exactly its own rows.
+    """
+    block = np.concatenate(rows, axis=0)
+    if dataset is None:
+        dataset = f.create_dataset(
+            "features", shape=(num_rows, block.shape[1]), dtype=dtype
+        )
+    dataset[start : start + len(block)] = block.astype(dtype, copy=False)
+    return dataset
+
+
+def evaluate(
+    data_dir: str,
+    splits: tuple[str, ...] = ("train", "val", "test"),
+    model: str = "medium-mpa-0",
+    device: str | None = None,
+    output_file: str | None = None,
+    batch_size: int = 64,
+    dtype: str = "float16",
+) -> None:
+    """Compute MACE descriptors for all structures in a dataset directory.
+
+    :param data_dir: Directory containing the split CSV files (e.g., "data/mp-20").
+    :param splits: Dataset splits to featurize, defaults to ("train", "val", "test")
+    :param model: MACE-MP foundation model name, defaults to "medium-mpa-0"
+    :param device: Device to use ("cuda" or "cpu").
+        If None, automatically detects CUDA availability, defaults to None
+    :param output_file: Path of the HDF5 file to write,
+        defaults to "<data_dir>/mace_features.h5"
+    :param batch_size: Number of structures buffered before their descriptors
+        are appended to the file, defaults to 64
+    :param dtype: Storage dtype of the descriptors ("float16" or "float32"),
+        defaults to "float16"
+    """
+    from mace.calculators import mace_mp  # type: ignore
+
+    if device is None:
+        device = "cuda" if torch.cuda.is_available() else "cpu"
+    if output_file is None:
+        output_file = os.path.join(data_dir, "mace_features.h5")
+    calc = mace_mp(model=model, device=device)
+
+    # Every atom gets one descriptor row, so the file size is known up front
+    datasets = {split: MPDataset(root=data_dir, split=split) for split in splits}
+    num_rows = sum(
+        int(dataset.slices["pos"][-1])  # type: ignore[index]
+        for dataset in datasets.values()
+    )
+
+    material_ids = []
+    offsets = [0]
+    with h5py.File(output_file, "w") as f:
+        features = None
+        buffer = []
+        written = 0
+        for split, dataset in datasets.items():
+            for data in tqdm(dataset, desc=f"Computing MACE features ({split})"):
+                atoms = batch_to_atoms_list(CrystalBatch.collate([data]))[0]
+                descriptors = np.asarray(
+                    calc.get_descriptors(atoms, invariants_only=True),
+                    dtype=np.float32,
+                )
+                material_ids.append(str(data.material_id))
+                offsets.append(offsets[-1] + len(descriptors))
+                buffer.append(descriptors)
+                if len(buffer) == batch_size:
+                    features = _write_rows(
+                        f, features, written, buffer, num_rows, dtype
+                    )
+                    written = offsets[-1]
+                    buffer = []
+        if buffer:
+            features = _write_rows(f, features, written, buffer, num_rows, dtype)
+        f.create_dataset("ids", data=np.array(material_ids, dtype="S"))
+        f.create_dataset("offsets", data=np.array(offsets, dtype=np.int64))
+    print(f"Saved MACE features of {len(material_ids)} structures to {output_file}")
+
+
+if __name__ == "__main__":
+    Fire(evaluate)
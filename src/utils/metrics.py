@@ -1,5 +1,6 @@
 """Evaluation metrics for crystal structure generation."""
 
+import functools
 import gzip
 import os
 import pickle
@@ -154,6 +155,38 @@ def _synthesizability(ctx):
     return clscore > 0.5
 
 
+###############################################################################
+#                            Cached reference data                            #
+###############################################################################
+# Reference data is shared across Metrics instances (e.g., RL reward restarts)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_reference_structures(reference_dataset: str) -> tuple[Structure, ...]:
+    return tuple(loadfn(PATH_REFERENCE_STRUCTURES[reference_dataset]))
+
+
+@functools.lru_cache(maxsize=4)
+def _load_reference_structures_by_formula(
+    reference_dataset: str,
+) -> dict[str, list[Structure]]:
+    ref_structures_by_formula = defaultdict(list)
+    for ref_structure in _load_reference_structures(reference_dataset):
+        ref_structures_by_formula[ref_structure.reduced_formula].append(ref_structure)
+    return ref_structures_by_formula
+
+
+@functools.lru_cache(maxsize=4)
+def _load_phase_diagram(phase_diagram: str) -> PatchedPhaseDiagram | PhaseDiagram:
+    with gzip.open(PATH_PHASE_DIAGRAM[phase_diagram], "rb") as f:
+        return pickle.load(f)
+
+
+@functools.lru_cache(maxsize=4)
+def _load_reference_features(path: Path) -> torch.Tensor:
+    return torch.load(path, map_location="cpu", weights_only=False)
+
+
 ###############################################################################
 #                                 Metrics                                     #
 ###############################################################################
@@ -272,20 +305,18 @@ class Metrics:
 
         # _reference_structures: `novel`
         if "novel" in self.metrics and not self._reference_structures:
-            path_reference_dataset = PATH_REFERENCE_STRUCTURES[self.reference_dataset]
-            self._reference_structures = loadfn(path_reference_dataset)
+            self._reference_structures = list(
+                _load_reference_structures(self.reference_dataset)
+            )
             print(f"Loaded reference {len(self._reference_structures)} structures")
-            self._ref_structures_by_formula = defaultdict(list)
-            for ref_structure in self._reference_structures:
-                self._ref_structures_by_formula[ref_structure.reduced_formula].append(
-                    ref_structure
-                )
+            self._ref_structures_by_formula = _load_reference_structures_by_formula(
+                self.reference_dataset
+            )
 
         # _pd: `e_above_hull`, `stable`
         if "e_above_hull" in self.metrics and self._pd is None:
             path_phase_diagram = PATH_PHASE_DIAGRAM[self.phase_diagram]
-            with gzip.open(path_phase_diagram, "rb") as f:
-                self._pd = pickle.load(f)
+            self._pd = _load_phase_diagram(self.phase_diagram)
             print(
                 f"Loaded phase diagram from {path_phase_diagram} with {len(self._pd)} entries"  # type: ignore
             )
@@ -316,10 +347,8 @@ class Metrics:
             and self._reference_structure_features is None
         ):
             path_reference_structure_features = self.reference_dataset.split("-")[0]
-            self._reference_structure_features = torch.load(
-                PATH_REFERENCE_STRUCTURE_FEATURES[path_reference_structure_features],
-                map_location="cpu",
-                weights_only=False,
+            self._reference_structure_features = _load_reference_features(
+                PATH_REFERENCE_STRUCTURE_FEATURES[path_reference_structure_features]
             )
 
         # _reference_composition_features: `composition_diversity`
@@ -328,12 +357,8 @@ class Metrics:
             and self._reference_composition_features is None
         ):
             path_reference_composition_features = self.reference_dataset.split("-")[0]
-            self._reference_composition_features = torch.load(
-                PATH_REFERENCE_COMPOSITION_FEATURES[
-                    path_reference_composition_features
-                ],
-                map_location="cpu",
-                weights_only=False,
+            self._reference_composition_features = _load_reference_features(
+                PATH_REFERENCE_COMPOSITION_FEATURES[path_reference_composition_features]
             )
 
     def compute(self, gen_structures: list[Structure]):
@@ -402,8 +427,10 @@ def calculate_energy_above_hull(
     calc: Calculator,
     gen_structure: Structure,
 ):
-    # Get the energy of the generated structure
-    gen_energy = calc.get_potential_energy(gen_structure.to_ase_atoms())
+    # Get the energy of the generated structure. mace-torch differentiates the
+    # energy w.r.t. positions, so grad is enabled only around this call
+    with torch.enable_grad():
+        gen_energy = calc.get_potential_energy(gen_structure.to_ase_atoms())
 
     # Check if energy is None
     if gen_energy is None:
@@ -0,0 +1,42 @@
+"""Sine / cosine embeddings of integer positions, shared by the transformers."""
+
+import functools
+import math
+
+import torch
+
+
+@functools.lru_cache(maxsize=8)
+def _embedding_denominator(
+    emb_dim: int, max_len: int, device: torch.device
+) -> torch.Tensor:
+    """Frequency denominators of the sine / cosine embeddings, cached per device.
+
+    Built outside inference mode: the first call may happen during sampling,
+    and a cached inference tensor cannot be saved for backward in training.
+    """
+    with torch.inference_mode(False):
+        K = torch.arange(emb_dim // 2, device=device)
+        return max_len ** (2 * K[None] / emb_dim)
+
+
+def sinusoidal_embedding(
+    indices: torch.Tensor, emb_dim: int, max_len: int = 2048
+) -> torch.Tensor:
+    """Creates sine / cosine positional embeddings from a prespecified indices.
+
+    Args:
+        indices: offsets of size [..., num_tokens] of type integer
+        emb_dim: dimension of the embeddings to create
+        max_len: maximum length
+
+    Returns:
+        positional embedding of shape [..., num_tokens, emb_dim]
+    """
+    # Sine and cosine share the same arguments, so compute them once
+    angles = (
+        indices[..., None]
+        * math.pi
+        / _embedding_denominator(emb_dim, max_len, indices.device)
+    )
+    return torch.cat([angles.sin(), angles.cos()], dim=-1)
@@ -2,37 +2,14 @@
 https://github.com/facebookresearch/all-atom-diffusion-transformer.
 """
 
-import math
-
 import torch
 from torch import nn
 from torch_geometric.utils import to_dense_batch
 
+from src.utils.positional_embedding import sinusoidal_embedding
 from src.utils.scatter import scatter_mean
 
 
-def get_index_embedding(indices, emb_dim, max_len=2048):
-    """Creates sine / cosine positional embeddings from a prespecified indices.
-
-    Args:
-        indices: offsets of size [..., num_tokens] of type integer
-        emb_dim: dimension of the embeddings to create
-        max_len: maximum length
-
-    Returns:
-        positional embedding of shape [..., num_tokens, emb_dim]
-    """
-    K = torch.arange(emb_dim // 2, device=indices.device)
-    pos_embedding_sin = torch.sin(
-        indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
-    ).to(indices.device)
-    pos_embedding_cos = torch.cos(
-        indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
-    ).to(indices.device)
-    pos_embedding = torch.cat([pos_embedding_sin, pos_embedding_cos], dim=-1)
-    return pos_embedding
-
-
 class TransformerDecoder(nn.Module):
     """Transformer decoder as part of pure Transformer-based VAEs.
 
@@ -99,7 +76,7 @@ class TransformerDecoder(nn.Module):
         x = encoded_batch["x"]
 
         # Positional embedding
-        x += get_index_embedding(encoded_batch["token_idx"], self.d_model)
+        x += sinusoidal_embedding(encoded_batch["token_idx"], self.d_model)
 
         # Convert from PyG batch to dense batch with padding
         x, token_mask = to_dense_batch(x, encoded_batch["batch"])
@@ -109,7 +86,12 @@ class TransformerDecoder(nn.Module):
         x = x[token_mask]
 
         # Global pooling: (n, d) -> (bsz, d)
-        x_global = scatter_mean(x, encoded_batch["batch"], dim=0)
+        x_global = scatter_mean(
+            x,
+            encoded_batch["batch"],
+            dim=0,
+            dim_size=encoded_batch["num_atoms"].numel(),
+        )
 
         # Atomic type prediction head
         if self.atom_type_predict:
@@ -2,35 +2,12 @@
 https://github.com/facebookresearch/all-atom-diffusion-transformer.
 """
 
-import math
-
 import torch
 from torch import nn
 from torch_geometric.utils import to_dense_batch
 
 from src.data.schema import CrystalBatch
-
-
-def get_index_embedding(indices, emb_dim, max_len=2048):
-    """Creates sine / cosine positional embeddings from a prespecified indices.
-
-    Args:
-        indices: offsets of size [..., num_tokens] of type integer
-        emb_dim: dimension of the embeddings to create
-        max_len: maximum length
-
-    Returns:
-        positional embedding of shape [..., num_tokens, emb_dim]
-    """
-    K = torch.arange(emb_dim // 2, device=indices.device)
-    pos_embedding_sin = torch.sin(
-        indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
-    ).to(indices.device)
-    pos_embedding_cos = torch.cos(
-        indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
-    ).to(indices.device)
-    pos_embedding = torch.cat([pos_embedding_sin, pos_embedding_cos], dim=-1)
-    return pos_embedding
+from src.utils.positional_embedding import sinusoidal_embedding
 
 
 class TransformerEncoder(nn.Module):
@@ -125,7 +102,7 @@ class TransformerEncoder(nn.Module):
         x += self.frac_coords_embedder(frac_coords)
 
         # Positional embedding
-        x += get_index_embedding(token_idx, self.d_model)
+        x += sinusoidal_embedding(token_idx, self.d_model)
 
         # Convert from PyG batch to dense batch with padding
         x, token_mask = to_dense_batch(x, batch_idx)
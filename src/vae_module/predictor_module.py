@@ -59,7 +59,8 @@ class PredictorModule(LightningModule):
             if self.use_encoder_features:
                 x = torch.cat([x, encoded["x"]], dim=-1)  # (B_n, L + H)
             x = x.to(self.device)
-        x = self.reduce_fn(x, batch.batch, dim=0)  # (B, L) or (B, L + H)
+        # (B, L) or (B, L + H)
+        x = self.reduce_fn(x, batch.batch, dim=0, dim_size=batch.num_graphs)
         x = self.proj(x)  # (B, num_targets)
         return x
 
@@ -113,7 +113,7 @@ class VAEModule(LightningModule):
         fa_loss = 0
         if self.hparams.loss_weights["fa"] > 0:
             z = self.proj(encoded["z"])
-            mace_features = batch.mace_features
+            mace_features = batch.mace_features.float()  # may be stored as fp16
             z_norm = F.normalize(z, dim=-1)
             mace_features_norm = F.normalize(mace_features, dim=-1)
             z_cos_sim = torch.einsum("ij,kj->ik", z_norm, z_norm)
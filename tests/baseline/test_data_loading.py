@@ -6,23 +6,34 @@ Tests include dataloader batching with shape validation, label alignment,
 and dtype verification.
 """
 
+from operator import attrgetter
+
 import pytest
 import torch
 
 from src.data.schema import CrystalBatch
 
+pytestmark = pytest.mark.usefixtures("inference_mode")
+
+BATCH_SIZE = 4
+
+
+@pytest.fixture(scope="module")
+def crystal_batch(dummy_crystal_batch):
+    """Single batch shared by the read-only checks in this module."""
+    return dummy_crystal_batch(batch_size=BATCH_SIZE, num_atom_distribution="mp-20")
+
 
 @pytest.mark.smoke
 @pytest.mark.baseline
-def test_dataloader_batching(dummy_crystal_batch, device) -> None:
+def test_dataloader_batching(crystal_batch, device) -> None:
     """Test dataloader batching with shape validation.
 
     Verifies that CrystalBatch properly batches crystal structures
     with correct shapes for all tensor attributes.
     """
-    # Create batch with multiple structures
-    batch_size = 4
-    batch = dummy_crystal_batch(batch_size=batch_size, num_atom_distribution="mp-20")
+    batch_size = BATCH_SIZE
+    batch = crystal_batch
 
     # Verify batch is CrystalBatch
     assert isinstance(batch, CrystalBatch)
@@ -32,59 +43,57 @@ def test_dataloader_batching(dummy_crystal_batch, device) -> None:
 
     # Verify tensor shapes for graph-level attributes
     # Lattice parameters: one per structure
-    assert batch.lengths.shape[0] == batch_size
-    assert batch.lengths.shape[1] == 3  # a, b, c lengths
-    assert batch.angles.shape[0] == batch_size
-    assert batch.angles.shape[1] == 3  # alpha, beta, gamma angles
-    assert batch.lattices.shape == (batch_size, 3, 3)  # Lattice matrix
+    # (a, b, c lengths), (alpha, beta, gamma angles), lattice matrix
+    assert (batch.lengths.shape, batch.angles.shape, batch.lattices.shape) == (
+        (batch_size, 3),
+        (batch_size, 3),
+        (batch_size, 3, 3),
+    )
 
     # Verify tensor shapes for node-level attributes
     # Total number of atoms across all structures
     total_atoms = batch.num_nodes
-    assert batch.atom_types.shape[0] == total_atoms
-    assert batch.frac_coords.shape == (total_atoms, 3)
-    assert batch.cart_coords.shape == (total_atoms, 3)
-    assert batch.pos.shape == (total_atoms, 3)
+    assert (
+        batch.frac_coords.shape
+        == batch.cart_coords.shape
+        == batch.pos.shape
+        == (total_atoms, 3)
+    )
 
-    # Verify token_idx for positional encoding
-    assert batch.token_idx.shape[0] == total_atoms
+    # Atom types and token_idx (for positional encoding): one per atom
+    assert batch.atom_types.shape == batch.token_idx.shape == (total_atoms,)
 
 
 @pytest.mark.smoke
 @pytest.mark.baseline
-def test_label_alignment(dummy_crystal_batch, device) -> None:
+def test_label_alignment(crystal_batch, device) -> None:
     """Test label alignment - count matches structure count.
 
     Verifies that graph-level labels (lattice parameters) match
     the number of structures in the batch, and node-level labels
     (atom properties) match the total number of atoms.
     """
-    batch_size = 3
-    batch = dummy_crystal_batch(batch_size=batch_size, num_atom_distribution="mp-20")
-
-    # Graph-level label counts should match batch_size
-    assert batch.lengths.shape[0] == batch_size, (
-        f"Length labels count ({batch.lengths.shape[0]}) "
-        f"does not match batch size ({batch_size})"
-    )
-    assert batch.angles.shape[0] == batch_size, (
-        f"Angle labels count ({batch.angles.shape[0]}) "
-        f"does not match batch size ({batch_size})"
+    batch_size = BATCH_SIZE
+    batch = crystal_batch
+
+    # Graph-level label counts (lengths, angles, lattices) should match batch_size
+    graph_counts = (
+        len(batch.lengths),
+        len(batch.angles),
+        len(batch.lattices),
     )
-    assert batch.lattices.shape[0] == batch_size, (
-        f"Lattice labels count ({batch.lattices.shape[0]}) "
-        f"does not match batch size ({batch_size})"
+    assert graph_counts == (batch_size,) * 3, (
+        f"Graph-level label counts {graph_counts} "
+        f"do not match batch size ({batch_size})"
     )
 
-    # Node-level label counts should match total atom count
+    # Node-level label counts (atom types, fractional coordinates) should match
+    # total atom count
     total_atoms = batch.num_nodes
-    assert batch.atom_types.shape[0] == total_atoms, (
-        f"Atom type labels count ({batch.atom_types.shape[0]}) "
-        f"does not match total atom count ({total_atoms})"
-    )
-    assert batch.frac_coords.shape[0] == total_atoms, (
-        f"Fractional coordinate labels count ({batch.frac_coords.shape[0]}) "
-        f"does not match total atom count ({total_atoms})"
+    node_counts = (len(batch.atom_types), len(batch.frac_coords))
+    assert node_counts == (total_atoms,) * 2, (
+        f"Node-level label counts {node_counts} "
+        f"do not match total atom count ({total_atoms})"
     )
 
     # Verify batch pointer integrity
@@ -96,13 +105,13 @@ def test_label_alignment(dummy_crystal_batch, device) -> None:
 
 @pytest.mark.smoke
 @pytest.mark.baseline
-def test_dtypes(dummy_crystal_batch, device) -> None:
+def test_dtypes(fixed_crystal_batch, device) -> None:
     """Test dtypes - float32 for coordinates, long for atom types.
 
     Verifies that all tensors in CrystalBatch have the correct
     data types for downstream model compatibility.
     """
-    batch = dummy_crystal_batch(batch_size=2, num_atom_distribution="mp-20")
+    batch = fixed_crystal_batch()
 
     # Float tensors for continuous values
     float_attributes = [
@@ -115,11 +124,13 @@ def test_dtypes(dummy_crystal_batch, device) -> None:
         "angles_radians",
         "lattices",
     ]
-    for attr in float_attributes:
-        tensor = getattr(batch, attr)
-        assert tensor.dtype == torch.float32, (
-            f"{attr} has dtype {tensor.dtype}, expected torch.float32"
-        )
+    tensors = attrgetter(*float_attributes)(batch)
+    wrong = [
+        (attr, tensor.dtype)
+        for attr, tensor in zip(float_attributes, tensors, strict=True)
+        if tensor.dtype != torch.float32
+    ]
+    assert not wrong, f"Expected torch.float32, got {wrong}"
 
     # Long/integer tensors for discrete values
     long_attributes = [
@@ -128,22 +139,24 @@ def test_dtypes(dummy_crystal_batch, device) -> None:
         "token_idx",
         "batch",
     ]
-    for attr in long_attributes:
-        tensor = getattr(batch, attr)
-        assert tensor.dtype == torch.long, (
-            f"{attr} has dtype {tensor.dtype}, expected torch.long"
-        )
+    tensors = attrgetter(*long_attributes)(batch)
+    wrong = [
+        (attr, tensor.dtype)
+        for attr, tensor in zip(long_attributes, tensors, strict=True)
+        if tensor.dtype != torch.long
+    ]
+    assert not wrong, f"Expected torch.long, got {wrong}"
 
 
 @pytest.mark.smoke
 @pytest.mark.baseline
-def test_device_placement(dummy_crystal_batch, device) -> None:
+def test_device_placement(fixed_crystal_batch, device) -> None:
     """Test that batch tensors are on the correct device.
 
     Verifies that all tensors in CrystalBatch are placed on
     the expected device (CPU or CUDA).
     """
-    batch = dummy_crystal_batch(batch_size=2, num_atom_distribution="mp-20")
+    batch = fixed_crystal_batch()
 
     # Check all tensor attributes are on the correct device
     tensor_attributes = [
@@ -157,9 +170,10 @@ def test_device_placement(dummy_crystal_batch, device) -> None:
         "num_atoms",
         "token_idx",
     ]
-
-    for attr in tensor_attributes:
-        tensor = getattr(batch, attr)
-        assert str(tensor.device).startswith(device), (
-            f"{attr} is on device {tensor.device}, expected {device}"
-        )
+    tensors = attrgetter(*tensor_attributes)(batch)
+    wrong = [
+        (attr, tensor.device)
+        for attr, tensor in zip(tensor_attributes, tensors, strict=True)
+        if tensor.device.type != device
+    ]
+    assert not wrong, f"Expected device {device}, got {wrong}"
@@ -72,7 +72,7 @@ def test_ldm_instantiation(ldm_model, device) -> None:
     assert isinstance(ldm_model.denoiser, nn.Module)
     assert ldm_model.vae is not None
     assert ldm_model.diffusion is not None
-    assert str(ldm_model.device).startswith(device)
+    assert ldm_model.device.type == device
 
     # Verify VAE is frozen
     for param in ldm_model.vae.parameters():
@@ -81,6 +81,7 @@ def test_ldm_instantiation(ldm_model, device) -> None:
 
 @pytest.mark.smoke
 @pytest.mark.baseline
+@pytest.mark.usefixtures("stub_num_atom_distributions")
 def test_ldm_forward_pass_shapes(ldm_model, dummy_crystal_batch, device) -> None:
     """Test LDM forward pass with shape validation.
 
@@ -90,6 +91,7 @@ def test_ldm_forward_pass_shapes(ldm_model, dummy_crystal_batch, device) -> None
     # Create small batch for smoke test
     batch = dummy_crystal_batch(batch_size=2, num_atom_distribution="mp-20")
     batch = batch.to(device)
+    assert batch.num_atoms.unique().numel() > 1  # mixed sizes exercise padding
 
     # Calculate loss (this runs the forward pass internally)
     ldm_model.eval()
@@ -95,11 +95,12 @@ def test_vae_instantiation(vae_model, device) -> None:
     assert isinstance(vae_model.decoder, nn.Module)
     assert vae_model.quant_conv is not None
     assert vae_model.post_quant_conv is not None
-    assert str(vae_model.device).startswith(device)
+    assert vae_model.device.type == device
 
 
 @pytest.mark.smoke
 @pytest.mark.baseline
+@pytest.mark.usefixtures("stub_num_atom_distributions")
 def test_vae_forward_pass_shapes(vae_model, dummy_crystal_batch, device) -> None:
     """Test VAE forward pass with shape validation.
 
@@ -109,6 +110,7 @@ def test_vae_forward_pass_shapes(vae_model, dummy_crystal_batch, device) -> None
     # Create small batch for smoke test
     batch = dummy_crystal_batch(batch_size=2, num_atom_distribution="mp-20")
     batch = batch.to(device)
+    assert batch.num_atoms.unique().numel() > 1  # mixed sizes exercise padding
 
     # Forward pass
     vae_model.eval()
@@ -5,9 +5,27 @@ and unit tests. Fixtures include device detection, dummy crystal data,
 and reproducibility helpers for PyTorch Lightning models.
 """
 
+import random
+import sys
+
 import numpy as np
+import pandas as pd
 import pytest
 import torch
+from pymatgen.core import Lattice, Structure
+from torch_geometric.data import Data
+
+from src.data.num_atom_distributions import NUM_ATOM_DISTRIBUTIONS
+from src.data.schema import CrystalBatch, create_empty_batch
+
+# Atom counts and their probabilities as arrays, built once per distribution
+_NUM_ATOM_ARRAYS = {
+    name: (
+        np.fromiter(distribution.keys(), dtype=np.int64),
+        np.fromiter(distribution.values(), dtype=np.float64),
+    )
+    for name, distribution in NUM_ATOM_DISTRIBUTIONS.items()
+}
 
 
 @pytest.fixture(scope="session")
@@ -21,8 +39,6 @@ def seed_everything():
     """Set random seeds for reproducibility across numpy, torch, and Python."""
 
     def _seed(seed_value=42) -> None:
-        import random
-
         random.seed(seed_value)
         np.random.seed(seed_value)
         torch.manual_seed(seed_value)
@@ -34,7 +50,40 @@ def seed_everything():
     return _seed
 
 
+@pytest.fixture(scope="module")
+def inference_mode():
+    """Run a whole test module under torch.inference_mode().
+
+    Only for modules that never backpropagate: tensors created here are
+    inference tensors and cannot be used in autograd afterwards.
+    """
+    with torch.inference_mode():
+        yield
+
+
+def _sample_num_atoms(num_atom_distribution: str, batch_size: int) -> list[int]:
+    """Draw the atom count of each dummy structure from a named distribution."""
+    keys, probs = _NUM_ATOM_ARRAYS[num_atom_distribution]
+    return np.random.choice(keys, p=probs, size=batch_size).tolist()
+
+
 @pytest.fixture(scope="function")
+def stub_num_atom_distributions(monkeypatch):
+    """Make dummy batches alternate between 2- and 3-atom structures.
+
+    For smoke tests that check output shapes and do not need realistic
+    structure sizes. Sizes cycle deterministically without touching the global
+    RNG, and any batch of two or more mixes sizes, so padding and masking
+    paths stay covered.
+    """
+
+    def _cycle_num_atoms(num_atom_distribution: str, batch_size: int) -> list[int]:
+        return [(2, 3)[i % 2] for i in range(batch_size)]
+
+    monkeypatch.setattr(sys.modules[__name__], "_sample_num_atoms", _cycle_num_atoms)
+
+
+@pytest.fixture(scope="session")
 def dummy_crystal_batch(device):
     """Create a small dummy CrystalBatch for testing model forward passes.
 
@@ -42,6 +91,10 @@ def dummy_crystal_batch(device):
     VAE, LDM, and RL modules. All tensors are initialized with valid values
     to avoid CUDA device assertions and NaN issues.
     Uses realistic atom count distributions from num_atom_distributions.
+
+    The factory is shared across the session, but every call builds a fresh
+    batch: tests seed the global RNGs before calling it and may modify the
+    batch they get, so results are not memoized.
     """
 
     def _create_batch(batch_size=2, num_atom_distribution="mp-20"):
@@ -54,17 +107,7 @@ def dummy_crystal_batch(device):
         Returns:
             CrystalBatch object ready for model testing
         """
-        from torch_geometric.data import Data
-
-        from src.data.num_atom_distributions import NUM_ATOM_DISTRIBUTIONS
-        from src.data.schema import CrystalBatch
-
-        distribution = NUM_ATOM_DISTRIBUTIONS[num_atom_distribution]
-        num_atoms = np.random.choice(
-            list(distribution.keys()),
-            p=list(distribution.values()),
-            size=batch_size,
-        ).tolist()
+        num_atoms = _sample_num_atoms(num_atom_distribution, batch_size)
 
         # Generate properly initialized dummy data for each structure
         data_list = []
@@ -103,6 +146,51 @@ def dummy_crystal_batch(device):
                 )
             )
 
-        return CrystalBatch.from_data_list(data_list).to(device=device)
+        batch = CrystalBatch.from_data_list(data_list)
+        if device == "cuda":
+            # Single async copy from page-locked memory
+            return batch.pin_memory().to(device, non_blocking=True)  # type: ignore
+        return batch.to(device)
 
     return _create_batch
+
+
+@pytest.fixture(scope="session")
+def fixed_crystal_batch(device):
+    """Create a CrystalBatch of identical small crystals without sampling.
+
+    Tensors are allocated but not initialized, so this is only meant for
+    tests that check batch structure (shapes, dtypes, devices), not values.
+    """
+
+    def _create_batch(batch_size=2, atoms_per_structure=2):
+        return create_empty_batch(
+            num_atoms=[atoms_per_structure] * batch_size,
+            device=device,
+            atom_types=[[1] * atoms_per_structure] * batch_size,
+        )
+
+    return _create_batch
+
+
+@pytest.fixture(scope="function")
+def mp_data_dir(tmp_path):
+    """Write train/val/test CSV splits of a few small crystals in MP format."""
+    structures = {
+        "mp-1": Structure(Lattice.cubic(3.0), ["Si", "Si"], [[0, 0, 0], [0.25] * 3]),
+        "mp-2": Structure(Lattice.cubic(4.0), ["Na", "Cl"], [[0, 0, 0], [0.5] * 3]),
+        "mp-3": Structure(
+            Lattice.hexagonal(3.0, 5.0),
+            ["Zn", "O", "O"],
+            [[0, 0, 0], [1 / 3, 2 / 3, 0.5], [2 / 3, 1 / 3, 0.25]],
+        ),
+    }
+    df = pd.DataFrame(
+        {
+            "material_id": list(structures),
+            "cif": [st.to(fmt="cif") for st in structures.values()],
+        }
+    )
+    for split in ("train", "val", "test"):
+        df.to_csv(tmp_path / f"{split}.csv", index=False)
+    return tmp_path
@@ -0,0 +1,28 @@
+"""Unit tests for the crystal DataModule."""
+
+from types import SimpleNamespace
+
+import pytest
+import torch
+
+from src.data.datamodule import DataModule
+
+pytestmark = pytest.mark.usefixtures("inference_mode")
+
+
+@pytest.mark.unit
+def test_preload_to_device_across_stages(mp_data_dir) -> None:
+    """Running setup("test") after the fit datasets were read must not fail."""
+    dm = DataModule(data_dir=str(mp_data_dir), batch_size=2, preload_to_device=True)
+    dm.trainer = SimpleNamespace(  # type: ignore[assignment]
+        strategy=SimpleNamespace(root_device=torch.device("cpu"))
+    )
+
+    dm.setup("fit")
+    train_dataset = dm.train_dataset
+    next(iter(dm.train_dataloader()))
+
+    dm.setup("test")
+    batch = next(iter(dm.test_dataloader()))
+    assert dm.train_dataset is train_dataset
+    assert batch.num_graphs == 2
@@ -6,22 +6,30 @@ from pymatgen.core import Lattice, Structure
 
 from src.utils.featurizer import featurize
 
+pytestmark = pytest.mark.usefixtures("inference_mode")
 
-@pytest.fixture
+_LATTICE = Lattice.cubic(5.0)
+
+
+@pytest.fixture(scope="module")
 def dummy_structures():
     """Create dummy pymatgen structures for testing."""
-    lattice = Lattice.cubic(5.0)
-    structures = [
-        Structure(lattice, ["Si", "Si"], [[0, 0, 0], [0.25, 0.25, 0.25]]),
-        Structure(lattice, ["Fe", "O"], [[0, 0, 0], [0.5, 0.5, 0.5]]),
+    return [
+        Structure(_LATTICE, ["Si", "Si"], [[0, 0, 0], [0.25, 0.25, 0.25]]),
+        Structure(_LATTICE, ["Fe", "O"], [[0, 0, 0], [0.5, 0.5, 0.5]]),
     ]
-    return structures
+
+
+@pytest.fixture(scope="module")
+def featurized_large(dummy_structures):
+    """Featurize all dummy structures in a single batch, shared by the tests."""
+    return featurize(dummy_structures, batch_size=2, device="cpu")
 
 
 @pytest.mark.unit
-def test_featurize_basic(dummy_structures):
+def test_featurize_basic(featurized_large):
     """Test basic featurization output structure."""
-    result = featurize(dummy_structures, batch_size=2, device="cpu")
+    result = featurized_large
 
     # Check output keys
     assert "structure_features" in result
@@ -30,9 +38,9 @@ def test_featurize_basic(dummy_structures):
 
 
 @pytest.mark.unit
-def test_featurize_shapes(dummy_structures):
+def test_featurize_shapes(dummy_structures, featurized_large):
     """Test output tensor shapes."""
-    result = featurize(dummy_structures, batch_size=2, device="cpu")
+    result = featurized_large
 
     # Structure features: (num_structures, feature_dim)
     assert result["structure_features"].shape[0] == len(dummy_structures)
@@ -48,26 +56,25 @@ def test_featurize_shapes(dummy_structures):
 
 
 @pytest.mark.unit
-def test_featurize_batch_processing(dummy_structures):
+def test_featurize_batch_processing(dummy_structures, featurized_large):
     """Test batch processing with different batch sizes."""
-    # Small batch size
+    # Small batch size; the large one (all structures at once) is shared
     result_small = featurize(dummy_structures, batch_size=1, device="cpu")
-
-    # Large batch size
-    result_large = featurize(dummy_structures, batch_size=10, device="cpu")
+    result_large = featurized_large
 
     # Results should be identical regardless of batch size
-    assert torch.allclose(
+    torch.testing.assert_close(
         result_small["structure_features"],
         result_large["structure_features"],
         atol=1e-5,
+        rtol=1e-5,
     )
 
 
 @pytest.mark.unit
-def test_featurize_encoder_features(dummy_structures):
+def test_featurize_encoder_features(dummy_structures, featurized_large):
     """Test with encoder features included."""
-    result_base = featurize(dummy_structures, use_encoder_features=False, device="cpu")
+    result_base = featurized_large  # use_encoder_features=False is the default
     result_with_encoder = featurize(
         dummy_structures, use_encoder_features=True, device="cpu"
     )
@@ -80,9 +87,9 @@ def test_featurize_encoder_features(dummy_structures):
 
 
 @pytest.mark.unit
-def test_featurize_reduce_methods(dummy_structures):
+def test_featurize_reduce_methods(dummy_structures, featurized_large):
     """Test different reduction methods (mean vs sum)."""
-    result_mean = featurize(dummy_structures, reduce="mean", device="cpu")
+    result_mean = featurized_large  # reduce="mean" is the default
     result_sum = featurize(dummy_structures, reduce="sum", device="cpu")
 
     # Both should have same shape
@@ -0,0 +1,84 @@
+"""Unit tests for the Materials Project dataset."""
+
+import os
+import pickle
+
+import h5py
+import numpy as np
+import pytest
+import torch
+
+from src.data.components import mp_dataset
+from src.data.components.mp_dataset import MPDataset
+
+pytestmark = pytest.mark.usefixtures("inference_mode")
+
+
+def _assert_same_dataset(actual, expected) -> None:
+    assert len(actual) == len(expected)
+    for idx in range(len(expected)):
+        data, expected_data = actual[idx], expected[idx]
+        assert sorted(data.keys()) == sorted(expected_data.keys())
+        for key in expected_data.keys():
+            if isinstance(expected_data[key], torch.Tensor):
+                assert torch.equal(data[key], expected_data[key]), key
+            else:
+                assert data[key] == expected_data[key], key
+
+
+@pytest.mark.unit
+def test_process_from_structure_cache(mp_data_dir, monkeypatch) -> None:
+    """Re-processing from the reduced-structure cache matches parsing the CIFs."""
+    cold = MPDataset(root=str(mp_data_dir), split="train")
+    assert os.path.exists(mp_data_dir / "processed" / "train_structures.npz")
+    os.remove(cold.processed_paths[0])
+
+    # CIFs must not be parsed again when the cache is valid
+    def _fail(*args, **kwargs):
+        raise AssertionError("CIFs were parsed despite the structure cache")
+
+    monkeypatch.setattr(mp_dataset, "ProcessPoolExecutor", _fail)
+    cached = MPDataset(root=str(mp_data_dir), split="train")
+    _assert_same_dataset(cached, cold)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("layout", ["packed", "legacy"])
+def test_mace_features_layouts(mp_data_dir, layout) -> None:
+    """Both HDF5 layouts attach the per-atom features of each material."""
+    dataset = MPDataset(root=str(mp_data_dir), split="train")
+    rng = np.random.default_rng(0)
+    features = {
+        str(material_id): rng.standard_normal((int(num_atoms), 4)).astype(np.float16)
+        for material_id, num_atoms in zip(
+            dataset.df["material_id"], dataset.num_atoms, strict=True
+        )
+    }
+
+    with h5py.File(mp_data_dir / "mace_features.h5", "w") as f:
+        if layout == "packed":
+            f["features"] = np.concatenate(list(features.values()))
+            f["ids"] = np.array(list(features), dtype="S")
+            f["offsets"] = np.cumsum([0] + [len(v) for v in features.values()])
+        else:
+            for material_id, value in features.items():
+                f[material_id] = value
+
+    dataset = MPDataset(root=str(mp_data_dir), split="train", mace_features=True)
+    for idx, expected in enumerate(features.values()):
+        assert torch.equal(dataset.get(idx).mace_features, torch.from_numpy(expected))
+
+
+@pytest.mark.unit
+def test_load_pickled_processed_file(mp_data_dir) -> None:
+    """Files processed before the tensor-only format are still readable."""
+    dataset = MPDataset(root=str(mp_data_dir), split="train")
+    # Unlink first: `dataset` still memory-maps the file it was loaded from
+    path = dataset.processed_paths[0]
+    os.remove(path)
+    torch.save((dataset._data, dataset.slices), path)
+    with pytest.raises(pickle.UnpicklingError):
+        torch.load(path, weights_only=True)
+
+    legacy = MPDataset(root=str(mp_data_dir), split="train")
+    _assert_same_dataset(legacy, dataset)
@@ -0,0 +1,36 @@
+"""Unit tests for sinusoidal positional embeddings."""
+
+import math
+
+import pytest
+import torch
+
+from src.utils.positional_embedding import _embedding_denominator, sinusoidal_embedding
+
+
+@pytest.mark.unit
+def test_sinusoidal_embedding_values() -> None:
+    """Embeddings match the uncached sine / cosine formula exactly."""
+    indices = torch.arange(12).reshape(3, 4)
+    emb_dim, max_len = 16, 2048
+
+    K = torch.arange(emb_dim // 2)
+    angles = indices[..., None] * math.pi / (max_len ** (2 * K[None] / emb_dim))
+    expected = torch.cat([torch.sin(angles), torch.cos(angles)], dim=-1)
+
+    embedding = sinusoidal_embedding(indices, emb_dim, max_len)
+    assert embedding.shape == (3, 4, emb_dim)
+    assert torch.equal(embedding, expected)
+
+
+@pytest.mark.unit
+def test_sinusoidal_embedding_cached_in_inference_mode() -> None:
+    """A denominator first cached during inference still supports backward."""
+    _embedding_denominator.cache_clear()
+    indices = torch.arange(5)
+    with torch.inference_mode():
+        sinusoidal_embedding(indices, 8)
+
+    positions = indices.float().requires_grad_()
+    sinusoidal_embedding(positions, 8).sum().backward()
+    assert positions.grad is not None
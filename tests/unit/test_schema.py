@@ -0,0 +1,114 @@
+"""Unit tests for the crystal batch schema."""
+
+import numpy as np
+import pytest
+import torch
+from torch_geometric.data import Data
+
+from src.data.schema import CrystalBatch, create_empty_batch
+
+pytestmark = pytest.mark.usefixtures("inference_mode")
+
+NUM_ATOMS = [2, 3, 1, 4]
+ATOM_TYPES = [[1, 8], [26, 8, 8], [14], [3, 3, 9, 9]]
+# Fields that `create_empty_batch` leaves uninitialized
+EMPTY_KEYS = (
+    "pos",
+    "frac_coords",
+    "cart_coords",
+    "lattices",
+    "lengths",
+    "lengths_scaled",
+    "angles",
+    "angles_radians",
+)
+
+
+def _collate_empty_data(num_atoms, atom_types=None):
+    """Reference batch built by collating one empty Data object per crystal."""
+    return CrystalBatch.from_data_list(
+        [
+            Data(
+                pos=torch.empty((n, 3)),
+                atom_types=(
+                    torch.empty((n,))
+                    if atom_types is None
+                    else torch.tensor(atom_types[i], dtype=torch.long)
+                ),
+                frac_coords=torch.empty((n, 3)),
+                cart_coords=torch.empty((n, 3)),
+                lattices=torch.empty((1, 3, 3)),
+                num_atoms=torch.as_tensor(n, dtype=torch.long),
+                lengths=torch.empty((1, 3)),
+                lengths_scaled=torch.empty((1, 3)),
+                angles=torch.empty((1, 3)),
+                angles_radians=torch.empty((1, 3)),
+                token_idx=torch.arange(n, dtype=torch.long),
+            )
+            for i, n in enumerate(num_atoms)
+        ]
+    )
+
+
+def _assert_same_data(actual, expected) -> None:
+    assert sorted(actual.keys()) == sorted(expected.keys())
+    for key in expected.keys():
+        assert actual[key].dtype == expected[key].dtype, key
+        assert torch.equal(actual[key], expected[key]), key
+
+
+def _assert_matches_collation(batch, expected, typed: bool) -> None:
+    """Check a batch against the collated reference, fields and bookkeeping."""
+    assert type(batch) is type(expected)
+    assert sorted(batch.keys()) == sorted(expected.keys())
+    for key in expected.keys():
+        assert batch[key].dtype == expected[key].dtype, key
+        assert batch[key].shape == expected[key].shape, key
+    for key in ("batch", "ptr", "token_idx", "num_atoms"):
+        assert torch.equal(batch[key], expected[key]), key
+    if typed:
+        assert torch.equal(batch.atom_types, expected.atom_types)
+
+    # PyG bookkeeping that the batch rebuilds by hand
+    assert batch.num_graphs == expected.num_graphs
+    assert batch.num_nodes == expected.num_nodes
+    assert batch._slice_dict.keys() == expected._slice_dict.keys()
+    for key, slices in expected._slice_dict.items():
+        assert torch.equal(batch._slice_dict[key], slices), key
+        assert torch.equal(batch._inc_dict[key], expected._inc_dict[key]), key
+
+    # Give the uninitialized fields identical values before comparing contents
+    generator = torch.Generator().manual_seed(0)
+    keys = EMPTY_KEYS if typed else (*EMPTY_KEYS, "atom_types")
+    for key in keys:
+        expected[key] = torch.rand(expected[key].shape, generator=generator)
+        batch[key] = expected[key].clone()
+
+    data_list = batch.to_data_list()
+    expected_list = expected.to_data_list()
+    assert len(data_list) == len(expected_list)
+    for data, expected_data in zip(data_list, expected_list, strict=True):
+        _assert_same_data(data, expected_data)
+
+    repeated = batch.repeat(2)
+    expected_repeated = expected.repeat(2)
+    assert repeated.num_graphs == 2 * len(NUM_ATOMS)
+    _assert_same_data(repeated, expected_repeated)
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "num_atoms",
+    [
+        NUM_ATOMS,
+        np.array(NUM_ATOMS, dtype=np.int64),
+        torch.tensor(NUM_ATOMS),
+    ],
+    ids=["list", "ndarray", "tensor"],
+)
+@pytest.mark.parametrize("atom_types", [None, ATOM_TYPES], ids=["empty", "typed"])
+def test_create_empty_batch_matches_collation(num_atoms, atom_types) -> None:
+    """The vectorized batch must match the per-crystal collation it replaces."""
+    batch = create_empty_batch(num_atoms, device="cpu", atom_types=atom_types)
+    expected = _collate_empty_data(NUM_ATOMS, atom_types)
+    _assert_matches_collation(batch, expected, typed=atom_types is not None)